@@ -3,13 +3,14 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from hasil_perhitungan import compute_results
+from hasil_perhitungan import compute_results, validasi_dataset
 from io import StringIO
 
 st.set_page_config(page_title="Sistem Pakar Fuzzy", layout="wide")
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 CSV_PATH = SCRIPT_DIR / "dataset_kandang.csv"
+MAKS_BARIS_BERMASALAH = 100
 
 # ============================================
 # INISIALISASI SESSION STATE
@@ -22,11 +23,46 @@ if "dataset" not in st.session_state:
     st.session_state["dataset"] = None
 if "dataset_source" not in st.session_state:
     st.session_state["dataset_source"] = None
+if "dataset_versi" not in st.session_state:
+    st.session_state["dataset_versi"] = 0
+if "dataset_mask" not in st.session_state:
+    st.session_state["dataset_mask"] = None
+if "dataset_laporan" not in st.session_state:
+    st.session_state["dataset_laporan"] = None
+if "dataset_bermasalah" not in st.session_state:
+    st.session_state["dataset_bermasalah"] = None
+if "upload_id" not in st.session_state:
+    st.session_state["upload_id"] = None
+if "upload_gagal" not in st.session_state:
+    st.session_state["upload_gagal"] = False
+if "uploader_versi" not in st.session_state:
+    st.session_state["uploader_versi"] = 0
+if "hasil_cache" not in st.session_state:
+    st.session_state["hasil_cache"] = None
 
 def go(page):
     st.session_state["page"] = page
     st.rerun()
 
+def set_dataset(df, source):
+    """
+    Simpan dataset aktif setelah divalidasi (sekali saat load), beserta
+    mask kualitas per baris dan laporannya.
+    dataset_versi dinaikkan agar hasil perhitungan lama tidak dipakai lagi.
+    """
+    mask, laporan, bermasalah = None, None, None
+    if df is not None:
+        df, mask, laporan = validasi_dataset(df)
+        # Contoh baris bermasalah untuk sidebar, cukup diambil sekali
+        bermasalah = df[~mask].head(MAKS_BARIS_BERMASALAH)
+
+    st.session_state["dataset"] = df
+    st.session_state["dataset_source"] = source
+    st.session_state["dataset_versi"] += 1
+    st.session_state["dataset_mask"] = mask
+    st.session_state["dataset_laporan"] = laporan
+    st.session_state["dataset_bermasalah"] = bermasalah
+
 
 # ============================================
 # FUNGSI LOAD CSV FLEXIBLE
@@ -154,69 +190,95 @@ with st.sidebar.expander("ℹ️ Cara Upload Dataset", expanded=False):
     - Simpan dengan encoding UTF-8
     """)
 
-# Upload dataset
-uploaded_file = st.sidebar.file_uploader(
-    "📤 Upload Dataset CSV",
-    type=['csv'],
-    help="Upload file CSV dengan data kandang Anda",
-    key="dataset_uploader"
-)
-
-# Process upload
-if uploaded_file is not None:
-    with st.sidebar:
-        with st.spinner("🔄 Memproses dataset..."):
-            df_uploaded, enc, sep = load_csv_flexible(uploaded_file)
-            
+# Panel dataset sebagai fragment: interaksi di sini tidak menjalankan ulang halaman utama
+@st.fragment
+def panel_dataset():
+    # Upload dataset
+    uploaded_file = st.file_uploader(
+        "📤 Upload Dataset CSV",
+        type=['csv'],
+        help="Upload file CSV dengan data kandang Anda",
+        key=f"dataset_uploader_{st.session_state['uploader_versi']}"
+    )
+
+    # Process upload (hanya sekali per file)
+    if uploaded_file is not None:
+        if uploaded_file.file_id != st.session_state["upload_id"]:
+            with st.spinner("🔄 Memproses dataset..."):
+                df_uploaded, enc, sep = load_csv_flexible(uploaded_file)
+
+            st.session_state["upload_id"] = uploaded_file.file_id
+            st.session_state["upload_gagal"] = df_uploaded is None
+
             if df_uploaded is not None:
-                # PENTING: Simpan ke session state SEGERA
-                st.session_state["dataset"] = df_uploaded.copy()  # .copy() penting!
-                st.session_state["dataset_source"] = "uploaded"
-                
-                st.success("✅ Dataset berhasil diupload!")
-                st.info(f"📊 Baris: {len(df_uploaded)} | Kolom: {len(df_uploaded.columns)}")
-                
-                # Preview data
-                with st.expander("👁️ Preview Dataset"):
-                    st.dataframe(df_uploaded.head(5), use_container_width=True)
-            else:
-                st.error("❌ Format CSV tidak valid!")
-                st.warning("Coba perbaiki format CSV atau hubungi admin.")
-
-# Coba load dataset lokal jika belum ada upload
-elif st.session_state["dataset"] is None and CSV_PATH.exists():
-    df_local, enc, sep = load_csv_flexible(CSV_PATH)
-    if df_local is not None:
-        st.session_state["dataset"] = df_local
-        st.session_state["dataset_source"] = "local"
-        st.sidebar.success(f"✅ Dataset lokal: {CSV_PATH.name}")
-
-# Info dataset yang sedang aktif
-if st.session_state["dataset"] is not None:
-    st.sidebar.markdown("---")
-    st.sidebar.markdown("### 📈 Dataset Aktif")
-    
-    df_info = st.session_state["dataset"]
-    source = st.session_state.get("dataset_source", "unknown")
-    
-    col1, col2 = st.sidebar.columns(2)
-    col1.metric("Total Baris", len(df_info))
-    col2.metric("Sumber", "Upload" if source == "uploaded" else "Lokal")
-    
-    # Validasi data
-    if 'Jumlah_Ayam' in df_info.columns:
-        valid_rows = len(df_info[df_info['Jumlah_Ayam'] > 0])
-        st.sidebar.write(f"✅ Baris valid: **{valid_rows}**")
-    
-    # Tombol reset (hanya untuk uploaded dataset)
-    if source == "uploaded":
-        if st.sidebar.button("🔄 Reset Dataset", help="Hapus dataset yang diupload"):
-            st.session_state["dataset"] = None
-            st.session_state["dataset_source"] = None
-            st.rerun()
-else:
-    st.sidebar.warning("⚠️ Belum ada dataset")
-    st.sidebar.info("Upload CSV untuk melihat perbandingan dengan data historis Anda")
+                # PENTING: Simpan ke session state SEGERA (validasi_dataset membuat salinan)
+                set_dataset(df_uploaded, "uploaded")
+                # Dataset berubah: jalankan ulang seluruh app agar halaman hasil ikut diperbarui
+                st.rerun()
+
+        if st.session_state["upload_gagal"]:
+            st.error("❌ Format CSV tidak valid!")
+            st.warning("Coba perbaiki format CSV atau hubungi admin.")
+        else:
+            df_uploaded = st.session_state["dataset"]
+            st.success("✅ Dataset berhasil diupload!")
+            st.info(f"📊 Baris: {len(df_uploaded)} | Kolom: {len(df_uploaded.columns)}")
+
+            # Preview data
+            with st.expander("👁️ Preview Dataset"):
+                st.dataframe(df_uploaded.head(5), use_container_width=True)
+
+    # Coba load dataset lokal jika belum ada upload
+    elif st.session_state["dataset"] is None and CSV_PATH.exists():
+        df_local, enc, sep = load_csv_flexible(CSV_PATH)
+        if df_local is not None:
+            set_dataset(df_local, "local")
+            st.success(f"✅ Dataset lokal: {CSV_PATH.name}")
+
+    # Info dataset yang sedang aktif
+    if st.session_state["dataset"] is not None:
+        st.markdown("---")
+        st.markdown("### 📈 Dataset Aktif")
+
+        df_info = st.session_state["dataset"]
+        source = st.session_state.get("dataset_source", "unknown")
+
+        col1, col2 = st.columns(2)
+        col1.metric("Total Baris", len(df_info))
+        col2.metric("Sumber", "Upload" if source == "uploaded" else "Lokal")
+
+        # Validasi data (dihitung sekali saat load, lihat set_dataset)
+        laporan = st.session_state["dataset_laporan"]
+        st.write(f"✅ Baris lolos validasi: **{laporan['baris_lolos']}**")
+
+        masalah = {k: v for k, v in laporan.items() if k not in ("total_baris", "baris_lolos") and v > 0}
+        if masalah:
+            with st.expander("🩺 Laporan Kualitas Data"):
+                for nama, jumlah in masalah.items():
+                    st.write(f"- {nama.replace('_', ' ').capitalize()}: **{jumlah}** baris")
+
+                df_masalah = st.session_state["dataset_bermasalah"]
+                if len(df_masalah) > 0:
+                    jumlah_gagal = laporan["total_baris"] - laporan["baris_lolos"]
+                    st.caption(f"Baris yang tidak lolos validasi ({len(df_masalah)} dari {jumlah_gagal}):")
+                    st.dataframe(df_masalah, use_container_width=True)
+
+        # Tombol reset (hanya untuk uploaded dataset)
+        if source == "uploaded":
+            if st.button("🔄 Reset Dataset", help="Hapus dataset yang diupload"):
+                set_dataset(None, None)
+                st.session_state["upload_id"] = None
+                st.session_state["upload_gagal"] = False
+                # Ganti key uploader agar file yang sudah diupload ikut dikosongkan
+                st.session_state["uploader_versi"] += 1
+                st.rerun()
+    else:
+        st.warning("⚠️ Belum ada dataset")
+        st.info("Upload CSV untuk melihat perbandingan dengan data historis Anda")
+
+
+with st.sidebar:
+    panel_dataset()
 
 
 # ============================================
@@ -252,12 +314,9 @@ def generate_saran(kd, dp, kategori):
 # ============================================
 # PAGE: INPUT
 # ============================================
-if st.session_state["page"] == "input":
-    st.title("🐔 Sistem Pakar Fuzzy Tsukamoto")
-    st.subheader("Penilaian Kelayakan Kandang Ayam Pedaging")
-    
-    st.markdown("---")
-    
+# Form input sebagai fragment: mengubah angka hanya memperbarui preview, bukan seluruh app
+@st.fragment
+def form_input():
     col1, col2 = st.columns([2, 1])
     
     with col1:
@@ -335,31 +394,42 @@ if st.session_state["page"] == "input":
         
         st.success("✅ Data tersimpan! Menghitung...")
         go("hasil")
+
+
+if st.session_state["page"] == "input":
+    st.title("🐔 Sistem Pakar Fuzzy Tsukamoto")
+    st.subheader("Penilaian Kelayakan Kandang Ayam Pedaging")
+    
+    st.markdown("---")
     
+    form_input()
     st.stop()
 
 
 # ============================================
 # PAGE: HASIL
 # ============================================
-if st.session_state["page"] == "hasil":
-    
-    if st.session_state["input_data"] is None:
-        st.warning("⚠️ Belum ada input data")
-        if st.button("← Kembali ke Input"):
-            go("input")
-        st.stop()
-    
-    # Ambil data input
+def get_hasil():
+    """
+    Ambil hasil compute_results dari session state.
+    Hanya dihitung ulang jika input atau dataset (dataset_versi) berubah,
+    sehingga section hasil di bawah cukup membaca cache ini.
+    """
     x = st.session_state["input_data"]
+    key = (x["luas"], x["jumlah"], x["sisa"], st.session_state["dataset_versi"])
     
-    # KRUSIAL: Ambil dataset dari session state
-    df = st.session_state.get("dataset", None)
+    cache = st.session_state["hasil_cache"]
+    if cache is None or cache[0] != key:
+        # KRUSIAL: Ambil dataset dari session state
+        df = st.session_state.get("dataset", None)
+        out = compute_results(x["luas"], x["jumlah"], x["sisa"], df)
+        st.session_state["hasil_cache"] = (key, out)
     
-    # Hitung hasil
-    out = compute_results(x["luas"], x["jumlah"], x["sisa"], df)
-    
-    st.title("📊 Hasil Analisis Kelayakan Kandang")
+    return st.session_state["hasil_cache"][1]
+
+
+def section_hasil_utama():
+    out = get_hasil()
     
     # Hasil Utama
     st.markdown("### 🎯 Hasil Perhitungan")
@@ -381,8 +451,10 @@ if st.session_state["page"] == "hasil":
     # Saran Pakar
     st.markdown("### 💡 Saran Pakar")
     st.info(generate_saran(out["kepadatan_user"], out["deplesi_user"], out["kategori"]))
-    
-    st.markdown("---")
+
+
+def section_perbandingan():
+    out = get_hasil()
     
     # Perbandingan Dataset
     if out["dataset_present"]:
@@ -418,11 +490,32 @@ if st.session_state["page"] == "hasil":
         2. Pastikan CSV memiliki kolom: `Jumlah_Ayam`, `Kepadatan`, `Deplesi_pct`
         3. Klik tombol "Kembali" dan hitung ulang
         """)
-    
-    st.markdown("---")
-    
+
+
+def navigasi_hasil():
     # Tombol navigasi
     col_nav1, col_nav2, col_nav3 = st.columns([2, 1, 2])
     with col_nav1:
         if st.button("← Kembali ke Input", use_container_width=True):
-            go("input")
\ No newline at end of file
+            go("input")
+
+
+if st.session_state["page"] == "hasil":
+    
+    if st.session_state["input_data"] is None:
+        st.warning("⚠️ Belum ada input data")
+        if st.button("← Kembali ke Input"):
+            go("input")
+        st.stop()
+    
+    st.title("📊 Hasil Analisis Kelayakan Kandang")
+    
+    section_hasil_utama()
+    
+    st.markdown("---")
+    
+    section_perbandingan()
+    
+    st.markdown("---")
+    
+    navigasi_hasil()
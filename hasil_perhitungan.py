@@ -61,10 +61,116 @@ def output_rendah(a):
     return 10 + a * 30  # 10-40
 
 
+# ==============================
+#   BASIS RULE TSUKAMOTO
+# ==============================
+# (indeks kepadatan, indeks deplesi, fungsi output, faktor pengali z)
+# Indeks keanggotaan: 0 = rendah, 1 = sedang, 2 = tinggi
+
+RULES = [
+    (0, 0, output_tinggi, 1.0),  # R1: Kepadatan Rendah + Deplesi Rendah → SANGAT LAYAK
+    (0, 1, output_sedang, 1.0),  # R2: Kepadatan Rendah + Deplesi Sedang → LAYAK
+    (0, 2, output_rendah, 1.0),  # R3: Kepadatan Rendah + Deplesi Tinggi → KURANG LAYAK
+    (1, 0, output_sedang, 1.0),  # R4: Kepadatan Sedang + Deplesi Rendah → LAYAK
+    (1, 1, output_rendah, 1.0),  # R5: Kepadatan Sedang + Deplesi Sedang → KURANG LAYAK
+    (1, 2, output_rendah, 0.7),  # R6: Kepadatan Sedang + Deplesi Tinggi → TIDAK LAYAK (lebih rendah dari R5)
+    (2, 0, output_rendah, 1.0),  # R7: Kepadatan Tinggi + Deplesi Rendah → KURANG LAYAK
+    (2, 1, output_rendah, 0.6),  # R8: Kepadatan Tinggi + Deplesi Sedang → TIDAK LAYAK
+    (2, 2, output_rendah, 0.5),  # R9: Kepadatan Tinggi + Deplesi Tinggi → SANGAT TIDAK LAYAK
+]
+
+
+def _build_trace(alpha, z, total_alpha):
+    """Susun jejak rule: α, z, dan kontribusi tiap rule terhadap nilai fuzzy"""
+    kontribusi = [(a * zi / total_alpha) if total_alpha > 0 else 0.0 for a, zi in zip(alpha, z)]
+    return {"alpha": alpha, "z": z, "kontribusi": kontribusi}
+
+
+# ==============================
+#   VALIDASI DATASET (SEKALI SAAT LOAD)
+# ==============================
+KOLOM_NUMERIK = ["Luas_m2", "Jumlah_Ayam", "Kepadatan", "Jumlah_Ayam2", "Mati", "Afkir", "Deplesi_pct", "Sisa_Hidup"]
+
+# Nilai di CSV dibulatkan 2 desimal
+TOLERANSI_KEPADATAN = 0.01
+TOLERANSI_DEPLESI = 0.01
+
+def validasi_dataset(df_dataset):
+    """
+    Validasi & perbaikan dataset secara vektor, cukup sekali saat load.
+    - Kolom numerik dikonversi sekali (nilai tidak valid → NaN)
+    - Kepadatan dihitung ulang = Jumlah_Ayam / Luas_m2
+    - Deplesi_pct dihitung ulang = (Mati + Afkir) / Jumlah_Ayam × 100
+    - Baris yang nilainya tidak cocok dengan hasil hitung ulang ditandai
+    Mengembalikan (df, mask, laporan): mask bernilai True untuk baris yang
+    lolos semua pemeriksaan, laporan berisi jumlah baris per masalah.
+    deplesi_kosong hanya informasi (data mortalitas tidak ada), tidak masuk mask.
+    """
+    df = df_dataset.copy()
+    masalah = {}
+
+    # 1. Konversi tipe
+    tidak_numerik = pd.Series(False, index=df.index)
+    for col in KOLOM_NUMERIK:
+        if col in df.columns:
+            asli = df[col]
+            df[col] = pd.to_numeric(asli, errors="coerce")
+            tidak_numerik |= asli.notna() & df[col].isna()
+        elif col in ("Mati", "Deplesi_pct"):
+            # Dipakai compute_results, jadi harus selalu ada
+            df[col] = np.nan
+    masalah["nilai_tidak_numerik"] = tidak_numerik
+
+    jumlah = df["Jumlah_Ayam"]
+    jumlah_valid = jumlah.where(jumlah > 0)
+    masalah["jumlah_ayam_invalid"] = jumlah_valid.isna()
+
+    if "Jumlah_Ayam2" in df.columns:
+        masalah["jumlah_ayam2_berbeda"] = df["Jumlah_Ayam2"].notna() & (df["Jumlah_Ayam2"] != jumlah)
+
+    # 2. Kepadatan
+    if "Luas_m2" in df.columns:
+        masalah["luas_invalid"] = df["Luas_m2"].notna() & ~(df["Luas_m2"] > 0)
+        kepadatan_hitung = jumlah_valid / df["Luas_m2"].where(df["Luas_m2"] > 0)
+        selisih = (df["Kepadatan"] - kepadatan_hitung).abs()
+        masalah["kepadatan_tidak_konsisten"] = selisih > TOLERANSI_KEPADATAN
+        df["Kepadatan"] = kepadatan_hitung.fillna(df["Kepadatan"])
+    masalah["kepadatan_kosong"] = df["Kepadatan"].isna()
+
+    # 3. Deplesi (kosong = tidak ada Deplesi_pct maupun Mati, dicatat sebelum dihitung ulang)
+    deplesi_kosong = df["Deplesi_pct"].isna() & df["Mati"].isna()
+    afkir = df["Afkir"].fillna(0) if "Afkir" in df.columns else 0
+    deplesi_hitung = ((df["Mati"] + afkir) / jumlah_valid) * 100
+    selisih = (df["Deplesi_pct"] - deplesi_hitung).abs()
+    masalah["deplesi_tidak_konsisten"] = selisih > TOLERANSI_DEPLESI
+    df["Deplesi_pct"] = deplesi_hitung.fillna(df["Deplesi_pct"])
+
+    # Perbaikan nilai nol/kosong pada deplesi (agar tetap tampil di grafik)
+    df["Deplesi_pct"] = df["Deplesi_pct"].fillna(0).replace(0, 0.0001)
+
+    masalah = pd.DataFrame(masalah)
+    mask = ~masalah.any(axis=1)
+
+    laporan = {
+        "total_baris": len(df),
+        "baris_lolos": int(mask.sum()),
+        "deplesi_kosong": int(deplesi_kosong.sum()),
+    }
+    laporan.update({col: int(masalah[col].sum()) for col in masalah.columns})
+
+    return df, mask, laporan
+
+
 # ==============================
 #   PERHITUNGAN UTAMA (DIPERBAIKI)
 # ==============================
-def compute_results(luas, jumlah_awal, sisa_hidup, df_dataset=None):
+def compute_results(luas, jumlah_awal, sisa_hidup, df_dataset=None, trace=False):
+    """
+    Hitung nilai kelayakan satu kandang.
+    Jika trace=True, hasil memuat "trace" berisi α, z, dan kontribusi
+    tiap rule (R1..R9) terhadap nilai fuzzy; z = 0 untuk rule yang tidak aktif.
+    df_dataset (opsional) harus berupa hasil validasi_dataset.
+    """
 
     # 1. Perhitungan mortalitas + deplesi
     mati = max(jumlah_awal - sisa_hidup, 0)
@@ -83,71 +189,24 @@ def compute_results(luas, jumlah_awal, sisa_hidup, df_dataset=None):
     # ==============================
     # 3. RULE FUZZY TSUKAMOTO (9 RULE LENGKAP)
     # ==============================
+    μ_k = (μ_k_r, μ_k_s, μ_k_t)
+    μ_d = (μ_d_r, μ_d_s, μ_d_t)
+
     rules = []
     alphas = []
-    
-    # RULE 1: Kepadatan Rendah + Deplesi Rendah → SANGAT LAYAK
-    α1 = min(μ_k_r, μ_d_r)
-    if α1 > 0:
-        z1 = output_tinggi(α1)
-        rules.append(α1 * z1)
-        alphas.append(α1)
-    
-    # RULE 2: Kepadatan Rendah + Deplesi Sedang → LAYAK
-    α2 = min(μ_k_r, μ_d_s)
-    if α2 > 0:
-        z2 = output_sedang(α2)
-        rules.append(α2 * z2)
-        alphas.append(α2)
-    
-    # RULE 3: Kepadatan Rendah + Deplesi Tinggi → KURANG LAYAK
-    α3 = min(μ_k_r, μ_d_t)
-    if α3 > 0:
-        z3 = output_rendah(α3)
-        rules.append(α3 * z3)
-        alphas.append(α3)
-    
-    # RULE 4: Kepadatan Sedang + Deplesi Rendah → LAYAK
-    α4 = min(μ_k_s, μ_d_r)
-    if α4 > 0:
-        z4 = output_sedang(α4)
-        rules.append(α4 * z4)
-        alphas.append(α4)
-    
-    # RULE 5: Kepadatan Sedang + Deplesi Sedang → KURANG LAYAK
-    α5 = min(μ_k_s, μ_d_s)
-    if α5 > 0:
-        z5 = output_rendah(α5)
-        rules.append(α5 * z5)
-        alphas.append(α5)
-    
-    # RULE 6: Kepadatan Sedang + Deplesi Tinggi → TIDAK LAYAK
-    α6 = min(μ_k_s, μ_d_t)
-    if α6 > 0:
-        z6 = output_rendah(α6) * 0.7  # Lebih rendah dari rule 5
-        rules.append(α6 * z6)
-        alphas.append(α6)
-    
-    # RULE 7: Kepadatan Tinggi + Deplesi Rendah → KURANG LAYAK
-    α7 = min(μ_k_t, μ_d_r)
-    if α7 > 0:
-        z7 = output_rendah(α7)
-        rules.append(α7 * z7)
-        alphas.append(α7)
-    
-    # RULE 8: Kepadatan Tinggi + Deplesi Sedang → TIDAK LAYAK
-    α8 = min(μ_k_t, μ_d_s)
-    if α8 > 0:
-        z8 = output_rendah(α8) * 0.6
-        rules.append(α8 * z8)
-        alphas.append(α8)
-    
-    # RULE 9: Kepadatan Tinggi + Deplesi Tinggi → SANGAT TIDAK LAYAK
-    α9 = min(μ_k_t, μ_d_t)
-    if α9 > 0:
-        z9 = output_rendah(α9) * 0.5
-        rules.append(α9 * z9)
-        alphas.append(α9)
+    trace_alpha = []
+    trace_z = []
+
+    for k_idx, d_idx, output, faktor in RULES:
+        α = min(μ_k[k_idx], μ_d[d_idx])
+        z = 0.0
+        if α > 0:
+            z = output(α) * faktor
+            rules.append(α * z)
+            alphas.append(α)
+        if trace:
+            trace_alpha.append(α)
+            trace_z.append(z)
 
     # Defuzzifikasi (Weighted Average)
     fuzzy_val = (sum(rules) / sum(alphas)) if len(alphas) > 0 else 0
@@ -160,28 +219,30 @@ def compute_results(luas, jumlah_awal, sisa_hidup, df_dataset=None):
     else:
         kategori = "Tidak Layak"
 
+    hasil = {
+        "kepadatan_user": kepadatan,
+        "deplesi_user": deplesi,
+        "fuzzy_val": fuzzy_val,
+        "kategori": kategori,
+    }
+    if trace:
+        hasil["trace"] = _build_trace(trace_alpha, trace_z, sum(alphas))
+
     # Jika dataset tidak ada
     if df_dataset is None:
-        return {
-            "kepadatan_user": kepadatan,
-            "deplesi_user": deplesi,
-            "fuzzy_val": fuzzy_val,
-            "kategori": kategori,
-            "dataset_present": False
-        }
+        hasil["dataset_present"] = False
+        return hasil
 
     # ==============================
     #   PENGOLAHAN DATASET
     # ==============================
-    df = df_dataset.copy()
-
-    # Perbaikan nilai nol pada deplesi
-    df["Deplesi_pct"] = df["Deplesi_pct"].fillna(0).replace(0, 0.0001)
+    # Dataset sudah divalidasi & diperbaiki sekali saat load (validasi_dataset)
+    df = df_dataset
 
     # Ringkasan dataset
     summary = {
         "total_ayam": int(df["Jumlah_Ayam"].sum()),
-        "total_mati": int(df["Mati"].dropna().sum()),
+        "total_mati": int(df["Mati"].sum()),
         "rata_kepadatan": df["Kepadatan"].mean()
     }
 
@@ -220,19 +281,98 @@ def compute_results(luas, jumlah_awal, sisa_hidup, df_dataset=None):
     )
 
     # Cari kandang paling mirip
-    df["selisih"] = (df["Kepadatan"] - kepadatan).abs()
-    df["selisih"] = pd.to_numeric(df["selisih"], errors="coerce")
-    top_similar = df.nsmallest(5, "selisih")[["No", "Kandang", "Kepadatan", "Deplesi_pct"]].reset_index(drop=True)
+    selisih = (df["Kepadatan"] - kepadatan).abs()
+    top_similar = df.loc[selisih.nsmallest(5).index, ["No", "Kandang", "Kepadatan", "Deplesi_pct"]].reset_index(drop=True)
 
-    return {
-        "kepadatan_user": kepadatan,
-        "deplesi_user": deplesi,
-        "fuzzy_val": fuzzy_val,
-        "kategori": kategori,
+    hasil.update({
         "dataset_present": True,
         "summary": summary,
         "chart_kepadatan": chart_kepadatan,
         "chart_kepadatan_dist": chart_kepadatan_dist,
         "chart_deplesi_dist": chart_deplesi_dist,
         "top_similar": top_similar
-    }
\ No newline at end of file
+    })
+    return hasil
+
+
+# ==============================
+#   PERHITUNGAN BATCH (VEKTORISASI)
+# ==============================
+# Versi numpy dari fungsi keanggotaan; urutan kondisi sama persis dengan
+# versi skalar sehingga batas (8, 12, 16, 5, 10, 15) dan NaN diperlakukan sama.
+
+def _kepadatan_v(x):
+    rendah = np.select([x <= 8, x < 12], [1.0, (12 - x) / 4], 0.0)
+    sedang = np.select([(x >= 8) & (x <= 12), (x > 12) & (x <= 16)], [(x - 8) / 4, (16 - x) / 4], 0.0)
+    tinggi = np.select([x <= 12, x < 16], [0.0, (x - 12) / 4], 1.0)
+    return rendah, sedang, tinggi
+
+def _deplesi_v(x):
+    rendah = np.select([x <= 5, x < 10], [1.0, (10 - x) / 5], 0.0)
+    sedang = np.select([(x >= 5) & (x <= 10), (x > 10) & (x <= 15)], [(x - 5) / 5, (15 - x) / 5], 0.0)
+    tinggi = np.select([x <= 10, x < 15], [0.0, (x - 10) / 5], 1.0)
+    return rendah, sedang, tinggi
+
+
+def compute_results_batch(luas, jumlah_awal, sisa_hidup, trace=False):
+    """
+    Hitung nilai kelayakan banyak kandang sekaligus (array numpy).
+    Hasil identik dengan compute_results per baris. Jika trace=True, hasil
+    memuat "trace" berisi array (n, 9) untuk "alpha", "z", dan "kontribusi".
+    """
+    luas, jumlah_awal, sisa_hidup = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=float)) for v in (luas, jumlah_awal, sisa_hidup))
+    )
+
+    # 1. Perhitungan mortalitas + deplesi
+    mati = np.maximum(jumlah_awal - sisa_hidup, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deplesi = np.where(jumlah_awal == 0, 0.0, (mati / jumlah_awal) * 100)
+        kepadatan = jumlah_awal / luas
+
+    # 2. Keanggotaan fuzzy
+    μ_k = _kepadatan_v(kepadatan)
+    μ_d = _deplesi_v(deplesi)
+
+    # 3. Rule fuzzy, dijumlah berurutan R1..R9 seperti versi skalar
+    total_rule = np.zeros_like(kepadatan)
+    total_alpha = np.zeros_like(kepadatan)
+    if trace:
+        trace_alpha = np.empty((len(kepadatan), len(RULES)))
+        trace_z = np.empty((len(kepadatan), len(RULES)))
+
+    for i, (k_idx, d_idx, output, faktor) in enumerate(RULES):
+        α = np.minimum(μ_k[k_idx], μ_d[d_idx])
+        z = np.where(α > 0, output(α) * faktor, 0.0)
+        total_rule = total_rule + α * z
+        total_alpha = total_alpha + α
+        if trace:
+            trace_alpha[:, i] = α
+            trace_z[:, i] = z
+
+    # Defuzzifikasi (Weighted Average)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fuzzy_val = np.where(total_alpha > 0, total_rule / total_alpha, 0.0)
+
+    # 4. Kategori akhir
+    kategori = np.select(
+        [fuzzy_val >= 60, fuzzy_val >= 35],
+        ["Layak", "Kurang Layak"],
+        "Tidak Layak"
+    )
+
+    hasil = {
+        "kepadatan": kepadatan,
+        "deplesi": deplesi,
+        "fuzzy_val": fuzzy_val,
+        "kategori": kategori,
+    }
+    if trace:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            kontribusi = np.where(
+                total_alpha[:, None] > 0,
+                trace_alpha * trace_z / total_alpha[:, None],
+                0.0
+            )
+        hasil["trace"] = {"alpha": trace_alpha, "z": trace_z, "kontribusi": kontribusi}
+    return hasil
@@ -0,0 +1,197 @@
+# uji_engine.py - Uji kesetaraan & performa engine fuzzy
+#
+# Jalankan: python uji_engine.py [--n 20000] [--seed 0] [--toleransi 1e-9] [--maks-faktor 1.5]
+#
+# Setiap engine di ENGINES dibandingkan dengan compute_results skalar
+# (acuan) pada input acak + kasus batas; trace batch (alpha, z, kontribusi)
+# juga dibandingkan dengan trace skalar. Keluar dengan kode 1 jika ada
+# engine yang hasilnya berbeda atau lebih lambat dari acuan melebihi faktor.
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from hasil_perhitungan import (
+    compute_results,
+    compute_results_batch,
+    kepadatan_rendah, kepadatan_sedang, kepadatan_tinggi,
+    deplesi_rendah, deplesi_sedang, deplesi_tinggi,
+    _kepadatan_v, _deplesi_v,
+)
+
+# ==============================
+#   DAFTAR ENGINE
+# ==============================
+# Setiap engine: f(luas, jumlah_awal, sisa_hidup) -> (fuzzy_val, kategori)
+# dengan argumen & hasil berupa array sepanjang n.
+
+def engine_skalar(luas, jumlah_awal, sisa_hidup):
+    hasil = [compute_results(l, j, s) for l, j, s in zip(luas, jumlah_awal, sisa_hidup)]
+    fuzzy_val = np.array([h["fuzzy_val"] for h in hasil], dtype=float)
+    kategori = np.array([h["kategori"] for h in hasil])
+    return fuzzy_val, kategori
+
+def engine_batch(luas, jumlah_awal, sisa_hidup):
+    hasil = compute_results_batch(luas, jumlah_awal, sisa_hidup)
+    return hasil["fuzzy_val"], hasil["kategori"]
+
+ACUAN = "skalar"
+ENGINES = {
+    "skalar": engine_skalar,
+    "batch": engine_batch,
+}
+
+# Titik batas fungsi keanggotaan (kelompok sedang memakai batas inklusif)
+BATAS_KEPADATAN = [8, 12, 16]
+BATAS_DEPLESI = [5, 10, 15]
+
+
+# ==============================
+#   PEMBUATAN INPUT
+# ==============================
+def kasus_batas():
+    """Input yang menghasilkan kepadatan/deplesi tepat di titik batas, plus kasus ekstrem"""
+    luas, jumlah, sisa = [], [], []
+
+    # Kepadatan & deplesi tepat di batas: jumlah = kd * 20, mati = dp% dari jumlah
+    for kd in BATAS_KEPADATAN + [0.5, 30]:
+        for dp in BATAS_DEPLESI + [0, 50]:
+            j = kd * 20
+            luas.append(20.0)
+            jumlah.append(j)
+            sisa.append(j - j * dp // 100)
+
+    # jumlah_awal == 0 dan sisa_hidup > jumlah_awal
+    luas += [100.0, 100.0, 100.0, 250.0]
+    jumlah += [0, 0, 1000, 3000]
+    sisa += [0, 50, 1500, 3001]
+
+    return np.array(luas, dtype=float), np.array(jumlah, dtype=float), np.array(sisa, dtype=float)
+
+def input_acak(n, rng):
+    """Input acak; sebagian diarahkan ke sekitar titik batas (±1 ulp)"""
+    jumlah = rng.integers(0, 20001, n).astype(float)
+    luas = rng.uniform(1, 2000, n)
+    sisa = np.where(rng.random(n) < 0.1, rng.integers(0, 25001, n), np.floor(jumlah * rng.uniform(0.7, 1.0, n)))
+
+    dekat = rng.random(n) < 0.3
+    kd = rng.choice(BATAS_KEPADATAN, n)
+    geser = rng.choice([-1, 0, 1], n)
+    luas_batas = np.where(jumlah > 0, jumlah / kd, luas)
+    luas_batas = np.where(geser < 0, np.nextafter(luas_batas, 0), luas_batas)
+    luas_batas = np.where(geser > 0, np.nextafter(luas_batas, np.inf), luas_batas)
+    luas = np.where(dekat, luas_batas, luas)
+
+    return luas, jumlah, sisa.astype(float)
+
+
+# ==============================
+#   PEMERIKSAAN
+# ==============================
+def cek_keanggotaan():
+    """Bandingkan fungsi keanggotaan vektor dengan versi skalar di sekitar titik batas"""
+    gagal = []
+    pasangan = [
+        (_kepadatan_v, (kepadatan_rendah, kepadatan_sedang, kepadatan_tinggi), BATAS_KEPADATAN, "kepadatan"),
+        (_deplesi_v, (deplesi_rendah, deplesi_sedang, deplesi_tinggi), BATAS_DEPLESI, "deplesi"),
+    ]
+    for fungsi_v, fungsi_skalar, batas, nama in pasangan:
+        b = np.array(batas, dtype=float)
+        x = np.concatenate([b, np.nextafter(b, -np.inf), np.nextafter(b, np.inf), [0.0, -1.0, 100.0, np.nan]])
+        hasil_v = fungsi_v(x)
+        for label, f, v in zip(("rendah", "sedang", "tinggi"), fungsi_skalar, hasil_v):
+            acuan = np.array([f(xi) for xi in x], dtype=float)
+            if not np.array_equal(acuan, v):
+                idx = np.flatnonzero(acuan != v)
+                gagal.append(f"{nama}_{label}: berbeda di x={x[idx].tolist()}")
+    return gagal
+
+def cek_kesetaraan(nama, engine, luas, jumlah, sisa, acuan, toleransi):
+    fuzzy_val, kategori = engine(luas, jumlah, sisa)
+    fuzzy_acuan, kategori_acuan = acuan
+    beda_nilai = ~np.isclose(fuzzy_val, fuzzy_acuan, rtol=0, atol=toleransi)
+    beda_kategori = kategori != kategori_acuan
+    beda = np.flatnonzero(beda_nilai | beda_kategori)
+    if len(beda) == 0:
+        return []
+    i = beda[0]
+    return [
+        f"{nama}: {len(beda)} baris berbeda, contoh luas={float(luas[i])!r} jumlah={float(jumlah[i])!r} "
+        f"sisa={float(sisa[i])!r} -> {float(fuzzy_val[i])!r}/{kategori[i]} "
+        f"(acuan {float(fuzzy_acuan[i])!r}/{kategori_acuan[i]})"
+    ]
+
+def cek_trace(luas, jumlah, sisa, toleransi):
+    """Bandingkan trace (alpha, z, kontribusi) compute_results_batch dengan compute_results skalar"""
+    batch = compute_results_batch(luas, jumlah, sisa, trace=True)["trace"]
+    skalar = [compute_results(l, j, s, trace=True)["trace"] for l, j, s in zip(luas, jumlah, sisa)]
+    gagal = []
+    for kunci in ("alpha", "z", "kontribusi"):
+        acuan = np.array([t[kunci] for t in skalar], dtype=float)
+        if acuan.shape != batch[kunci].shape:
+            gagal.append(f"trace {kunci}: bentuk {batch[kunci].shape} (acuan {acuan.shape})")
+            continue
+        beda = np.flatnonzero((~np.isclose(batch[kunci], acuan, rtol=0, atol=toleransi)).any(axis=1))
+        if len(beda) > 0:
+            i = beda[0]
+            gagal.append(
+                f"trace {kunci}: {len(beda)} baris berbeda, contoh luas={float(luas[i])!r} "
+                f"jumlah={float(jumlah[i])!r} sisa={float(sisa[i])!r} -> {batch[kunci][i].tolist()} "
+                f"(acuan {acuan[i].tolist()})"
+            )
+    return gagal
+
+def ukur_waktu(engine, luas, jumlah, sisa, ulang=3):
+    """Waktu terbaik dari beberapa kali eksekusi (detik)"""
+    terbaik = float("inf")
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        engine(luas, jumlah, sisa)
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    return terbaik
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Uji kesetaraan & performa engine fuzzy")
+    parser.add_argument("--n", type=int, default=20000, help="Jumlah input acak")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--toleransi", type=float, default=1e-9, help="Selisih absolut maksimum nilai fuzzy")
+    parser.add_argument("--maks-faktor", type=float, default=1.5,
+                        help="Engine gagal jika waktunya > faktor x waktu engine acuan")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    batas = kasus_batas()
+    acak = input_acak(args.n, rng)
+    luas, jumlah, sisa = (np.concatenate([a, b]) for a, b in zip(batas, acak))
+
+    gagal = cek_keanggotaan()
+    gagal += cek_trace(luas, jumlah, sisa, args.toleransi)
+
+    acuan = ENGINES[ACUAN](luas, jumlah, sisa)
+    waktu_acuan = ukur_waktu(ENGINES[ACUAN], luas, jumlah, sisa)
+    print(f"{ACUAN:<10} {waktu_acuan * 1000:9.2f} ms  (acuan, {len(luas)} baris)")
+
+    for nama, engine in ENGINES.items():
+        if nama == ACUAN:
+            continue
+        gagal += cek_kesetaraan(nama, engine, luas, jumlah, sisa, acuan, args.toleransi)
+        waktu = ukur_waktu(engine, luas, jumlah, sisa)
+        faktor = waktu / waktu_acuan
+        print(f"{nama:<10} {waktu * 1000:9.2f} ms  ({faktor:.3f}x acuan)")
+        if faktor > args.maks_faktor:
+            gagal.append(f"{nama}: {faktor:.2f}x lebih lambat dari acuan (maks {args.maks_faktor}x)")
+
+    if gagal:
+        print("\nGAGAL:")
+        for g in gagal:
+            print(f"- {g}")
+        return 1
+
+    print("\nOK: semua engine setara dengan acuan")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())